@@ -1,11 +1,21 @@
 #!/usr/bin/env python3
 import os
+
+# Set before aws_cdk is imported: skip per-call stack-frame capture in the
+# jsii bridge and reuse the unpacked jsii runtime package between runs
+os.environ.setdefault("CDK_DISABLE_STACK_TRACE", "1")
+os.environ.setdefault("JSII_RUNTIME_PACKAGE_CACHE", "enabled")
+
 import aws_cdk as cdk
-from aws_vllm_openwebui.network_stack import VLLMNetworkStack
-from aws_vllm_openwebui.loadbalancer_stack import VLLMLoadBalancerStack
-from aws_vllm_openwebui.service_stack import VLLMServiceStack
+from aws_vllm_openwebui.vllm_stack import VLLMStack
 
-app = cdk.App()
+# Skip the per-construct creation stack traces and the tree.json walk;
+# both re-traverse every child in the construct tree during synth and
+# neither is needed outside of debugging
+app = cdk.App(
+    stack_traces=False,
+    tree_metadata=False
+)
 
 # Define environment
 env = cdk.Environment(
@@ -13,13 +23,21 @@ env = cdk.Environment(
     region=os.environ.get("CDK_DEFAULT_REGION")
 )
 
-# Create the stacks with dependencies and environment
-network_stack = VLLMNetworkStack(app, "VLLMNetworkStack", env=env)
-lb_stack = VLLMLoadBalancerStack(app, "VLLMLoadBalancerStack", network_stack, env=env)
-service_stack = VLLMServiceStack(app, "VLLMServiceStack", network_stack, lb_stack, env=env)
-
-# Add dependencies
-lb_stack.add_dependency(network_stack)
-service_stack.add_dependency(lb_stack)
+# Single stack; construct references are resolved in-stack instead of
+# through CloudFormation Exports/Imports. CDK_COMPONENTS (e.g.
+# "loadbalancer") limits synthesis to that layer and its dependencies.
+#
+# WARNING: CDK_COMPONENTS is SYNTH-ONLY (cdk synth / cdk diff). Deploying
+# a filtered template updates the real stack and DELETES every resource
+# of the skipped layers — including the WebUI data bucket. Never combine
+# it with cdk deploy.
+components = VLLMStack.resolve_components(os.environ.get("CDK_COMPONENTS"))
+if components != VLLMStack.resolve_components(None) \
+        and os.environ.get("CDK_CLI_COMMAND") == "deploy":
+    raise RuntimeError(
+        "CDK_COMPONENTS is synth-only: deploying a filtered VLLMStack would "
+        "delete the skipped layers' resources. Unset CDK_COMPONENTS to deploy."
+    )
+VLLMStack(app, "VLLMStack", components=components, env=env)
 
 app.synth()
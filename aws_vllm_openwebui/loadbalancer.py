@@ -4,81 +4,84 @@ from aws_cdk import (
     aws_ec2 as ec2,
     aws_cloudfront as cloudfront,
     aws_cloudfront_origins as origins,
-    aws_secretsmanager as secretsmanager,
     Duration,
     CfnOutput,
-    Fn,
 )
 from constructs import Construct
 
+from .network import NetworkConstruct
 
-class VLLMLoadBalancerStack(Stack):
-    def __init__(self, scope: Construct, construct_id: str, network_stack, **kwargs) -> None:
-        super().__init__(scope, construct_id, **kwargs)
 
-        # Create a secret for the custom header with a fixed value
-        # This ensures the value persists across deployments
-        custom_header_secret = secretsmanager.Secret(
-            self, "CustomHeaderSecret",
-            generate_secret_string=secretsmanager.SecretStringGenerator(
-                exclude_characters="\"@/\\",
-                exclude_punctuation=True,
-                include_space=False,
-                password_length=32
-            )
-        )
-        
-        # Get the secret ARN for reference
-        secret_arn = custom_header_secret.secret_arn
-        
+class LoadBalancerConstruct(Construct):
+    """ALBs, target groups and the CloudFront distribution for the WebUI."""
+
+    def __init__(self, scope: Construct, construct_id: str, network: NetworkConstruct) -> None:
+        super().__init__(scope, construct_id)
+
         # Use a fixed header value for development/testing
         # In production, you would use a more secure approach
         custom_header_name = "X-Custom-Header"
-        custom_header_value = "only-from-cloudfront-fixed-value"
+        # All values the ALB accepts from CloudFront. The ALB evaluates
+        # listener rules one by one per request, so keep additional values
+        # (e.g. the old one during a rotation) in this list and this single
+        # rule instead of adding more rules.
+        custom_header_values = ["only-from-cloudfront-fixed-value"]
+        custom_header_value = custom_header_values[0]
 
         # Create internal ALB for vLLM service
         self.vllm_alb = elbv2.ApplicationLoadBalancer(
             self, "VLLMALB",
-            vpc=network_stack.vpc,
+            vpc=network.vpc,
             internet_facing=False,
             vpc_subnets=ec2.SubnetSelection(
                 subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS
             ),
-            security_group=network_stack.vllm_alb_sg
+            security_group=network.vllm_alb_sg
         )
 
         # Create public ALB for WebUI
         self.webui_alb = elbv2.ApplicationLoadBalancer(
             self, "WebUIALB",
-            vpc=network_stack.vpc,
+            vpc=network.vpc,
             internet_facing=True,
             vpc_subnets=ec2.SubnetSelection(
                 subnet_type=ec2.SubnetType.PUBLIC
             ),
-            security_group=network_stack.webui_alb_sg
+            security_group=network.webui_alb_sg,
+            idle_timeout=Duration.seconds(300)  # Keep WebSocket streams alive between chat turns
         )
 
         # Create target groups
         self.vllm_target_group = elbv2.ApplicationTargetGroup(
             self, "VLLMTargetGroup",
-            vpc=network_stack.vpc,
+            vpc=network.vpc,
             port=8000,
             protocol=elbv2.ApplicationProtocol.HTTP,
             target_type=elbv2.TargetType.INSTANCE,
+            # Generation time varies by orders of magnitude with prompt
+            # length, so route new requests to the least-busy instance
+            # instead of round-robin
+            load_balancing_algorithm_type=elbv2.TargetGroupLoadBalancingAlgorithmType.LEAST_OUTSTANDING_REQUESTS,
+            # Keep a conversation on the same instance so follow-up turns
+            # reuse that instance's KV cache instead of re-running prefill
+            stickiness_cookie_duration=Duration.minutes(30),
             health_check=elbv2.HealthCheck(
-                path="/health",
+                path="/v1/models",  # Deeper than /health: only passes once the model is loaded
                 healthy_http_codes="200",
-                interval=Duration.seconds(60),
-                timeout=Duration.seconds(15)
+                interval=Duration.seconds(10),
+                timeout=Duration.seconds(5),
+                healthy_threshold_count=2
             )
         )
 
         self.webui_target_group = elbv2.ApplicationTargetGroup(
             self, "WebUITargetGroup",
-            vpc=network_stack.vpc,
+            vpc=network.vpc,
             port=8080,  # OpenWebUI uses port 8080 by default
             protocol=elbv2.ApplicationProtocol.HTTP,
             target_type=elbv2.TargetType.IP,
+            stickiness_cookie_duration=Duration.hours(1),  # Reuse the same task's connections per client
+            deregistration_delay=Duration.seconds(30),
             health_check=elbv2.HealthCheck(
                 path="/health",
                 healthy_http_codes="200",
@@ -109,28 +112,51 @@ class VLLMLoadBalancerStack(Stack):
             "ForwardToTargetGroup",
             priority=10,  # Add priority as required by the API
             conditions=[
-                elbv2.ListenerCondition.http_header(custom_header_name, [custom_header_value])
+                elbv2.ListenerCondition.http_header(custom_header_name, custom_header_values)
             ],
             action=elbv2.ListenerAction.forward([self.webui_target_group])
         )
 
+        # Single origin shared by all behaviors
+        webui_origin = origins.LoadBalancerV2Origin(
+            self.webui_alb,
+            protocol_policy=cloudfront.OriginProtocolPolicy.HTTP_ONLY,
+            custom_headers={
+                custom_header_name: custom_header_value
+            },
+            # Origin Shield collapses duplicate cache misses from edge
+            # locations into a single regional cache in front of the ALB
+            origin_shield_enabled=True,
+            origin_shield_region=Stack.of(self).region
+        )
+
+        # Static assets are immutable per release, so serve them from the
+        # edge cache; only API/WebSocket traffic stays uncached
+        static_behavior = cloudfront.BehaviorOptions(
+            origin=webui_origin,
+            viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
+            cache_policy=cloudfront.CachePolicy.CACHING_OPTIMIZED,
+            # Brotli/gzip at the edge roughly halves JS/CSS bytes on the wire
+            compress=True,
+            response_headers_policy=cloudfront.ResponseHeadersPolicy.SECURITY_HEADERS
+        )
+
         # Create CloudFront distribution for HTTPS access
         self.webui_distribution = cloudfront.Distribution(
             self, "WebUIDistribution",
             default_behavior=cloudfront.BehaviorOptions(
-                origin=origins.LoadBalancerV2Origin(
-                    self.webui_alb,
-                    protocol_policy=cloudfront.OriginProtocolPolicy.HTTP_ONLY,
-                    custom_headers={
-                        custom_header_name: custom_header_value
-                    }
-                ),
+                origin=webui_origin,
                 viewer_protocol_policy=cloudfront.ViewerProtocolPolicy.REDIRECT_TO_HTTPS,
                 allowed_methods=cloudfront.AllowedMethods.ALLOW_ALL,
                 cache_policy=cloudfront.CachePolicy.CACHING_DISABLED,
                 origin_request_policy=cloudfront.OriginRequestPolicy.ALL_VIEWER
             ),
+            additional_behaviors={
+                "/static/*": static_behavior,
+                "/assets/*": static_behavior
+            },
             price_class=cloudfront.PriceClass.PRICE_CLASS_100,  # Use only North America and Europe edge locations
+            http_version=cloudfront.HttpVersion.HTTP2_AND_3,  # Multiplex viewer requests over fewer connections
             enable_logging=False,
             comment="CloudFront distribution for OpenWebUI"
         )
@@ -143,8 +169,3 @@ class VLLMLoadBalancerStack(Stack):
         CfnOutput(self, "WebUIEndpoint", 
                  value=f"https://{self.webui_distribution.distribution_domain_name}",
                  description="WebUI HTTPS endpoint (CloudFront)")
-        
-        # Output the secret ARN for reference (but not the value)
-        CfnOutput(self, "CustomHeaderSecretArn", 
-                 value=secret_arn,
-                 description="ARN of the secret containing the custom header value")
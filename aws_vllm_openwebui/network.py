@@ -1,14 +1,15 @@
 from aws_cdk import (
-    Stack,
     aws_ec2 as ec2,
     CfnOutput,
 )
 from constructs import Construct
 
 
-class VLLMNetworkStack(Stack):
-    def __init__(self, scope: Construct, construct_id: str, **kwargs) -> None:
-        super().__init__(scope, construct_id, **kwargs)
+class NetworkConstruct(Construct):
+    """VPC and security groups shared by the load balancers and services."""
+
+    def __init__(self, scope: Construct, construct_id: str) -> None:
+        super().__init__(scope, construct_id)
 
         # Create VPC with public and private subnets
         self.vpc = ec2.Vpc(
@@ -29,6 +30,33 @@ class VLLMNetworkStack(Stack):
             ]
         )
 
+        # Keep AWS service traffic (image pulls, secret fetches, logs) inside
+        # the VPC instead of paying NAT data processing for every byte
+        self.vpc.add_gateway_endpoint(
+            "S3Endpoint",
+            service=ec2.GatewayVpcEndpointAwsService.S3
+        )
+        self.vpc.add_interface_endpoint(
+            "EcrEndpoint",
+            service=ec2.InterfaceVpcEndpointAwsService.ECR
+        )
+        self.vpc.add_interface_endpoint(
+            "EcrDockerEndpoint",
+            service=ec2.InterfaceVpcEndpointAwsService.ECR_DOCKER
+        )
+        self.vpc.add_interface_endpoint(
+            "SecretsManagerEndpoint",
+            service=ec2.InterfaceVpcEndpointAwsService.SECRETS_MANAGER
+        )
+        self.vpc.add_interface_endpoint(
+            "SsmEndpoint",
+            service=ec2.InterfaceVpcEndpointAwsService.SSM
+        )
+        self.vpc.add_interface_endpoint(
+            "CloudWatchLogsEndpoint",
+            service=ec2.InterfaceVpcEndpointAwsService.CLOUDWATCH_LOGS
+        )
+
         # Create security groups for ALBs
         self.vllm_alb_sg = ec2.SecurityGroup(
             self, "VLLMALBSecurityGroup",
@@ -86,28 +114,6 @@ class VLLMNetworkStack(Stack):
             ec2.Port.tcp(80),
             "Allow public HTTP access"
         )
-        
-        # Allow EFS access from WebUI security group
-        self.efs_sg = ec2.SecurityGroup(
-            self, "EFSSecurityGroup",
-            vpc=self.vpc,
-            description="Security group for EFS",
-            allow_all_outbound=True
-        )
-        
-        # Allow NFS access from WebUI security group to EFS security group
-        self.efs_sg.add_ingress_rule(
-            self.webui_sg,
-            ec2.Port.tcp(2049),
-            "Allow NFS access from WebUI service"
-        )
-        
-        # Add a more permissive rule for ECS tasks
-        self.efs_sg.add_ingress_rule(
-            ec2.Peer.ipv4(self.vpc.vpc_cidr_block),
-            ec2.Port.tcp(2049),
-            "Allow NFS access from all resources in VPC"
-        )
 
         # Outputs
         CfnOutput(self, "VpcId", value=self.vpc.vpc_id)
@@ -0,0 +1,380 @@
+import functools
+import os
+
+from aws_cdk import (
+    Stack,
+    aws_ecs as ecs,
+    aws_ec2 as ec2,
+    aws_autoscaling as autoscaling,
+    aws_iam as iam,
+    aws_secretsmanager as secretsmanager,
+    aws_s3 as s3,
+    aws_s3_assets as s3_assets,
+    Duration,
+    RemovalPolicy,
+)
+from constructs import Construct
+
+from .loadbalancer import LoadBalancerConstruct
+from .network import NetworkConstruct
+
+# Default model served by vLLM when none is provided in the "vllm" context
+DEFAULT_MODEL_NAME = "google/medgemma-4b-it"
+
+
+# Public SSM parameter published by AWS for the Deep Learning OSS Nvidia
+# Driver AMI GPU PyTorch 2.6 (Ubuntu 22.04), x86_64
+DL_AMI_SSM_PARAMETER = "/aws/service/deeplearning/ami/x86_64/oss-nvidia-driver-gpu-pytorch-2.6-ubuntu-22.04/latest/ami-id"
+
+
+@functools.lru_cache(maxsize=None)
+def _get_dl_ami():
+    """Return the Deep Learning AMI, built once per process.
+
+    The AMI is resolved from the public SSM parameter, so the stack works
+    in any region where the DLAMI is published and the resolved AMI ID is
+    cached in cdk.context.json instead of being looked up on every synth.
+    The lru_cache keeps repeated stack instantiations (e.g. in tests or
+    multi-stack apps) from rebuilding the same MachineImage object and
+    re-crossing the jsii bridge.
+    """
+    return ec2.MachineImage.from_ssm_parameter(
+        DL_AMI_SSM_PARAMETER,
+        os=ec2.OperatingSystemType.LINUX,
+        cached_in_context=True
+    )
+
+
+class ServiceConstruct(Construct):
+    """vLLM EC2 Auto Scaling Group and the OpenWebUI ECS service."""
+
+    def __init__(self, scope: Construct, construct_id: str, network: NetworkConstruct,
+                 loadbalancer: LoadBalancerConstruct) -> None:
+        super().__init__(scope, construct_id)
+
+        # Get model name from context or use default (single context lookup)
+        ctx = self.node.try_get_context("vllm") or {}
+        model_name = ctx.get("model", DEFAULT_MODEL_NAME)
+        # Optional region->AMI map of images with vLLM (and ideally the model
+        # weights) already baked in, e.g. produced by EC2 Image Builder
+        prebaked_ami = ctx.get("prebaked_ami")
+        # Optional EBS snapshot holding a pre-downloaded HuggingFace cache;
+        # loading weights from EBS beats re-downloading them from the HF CDN
+        # on every scale-out
+        weights_snapshot_id = ctx.get("weights_snapshot_id")
+
+        # Import the existing HuggingFace token secret
+        hf_token_secret = secretsmanager.Secret.from_secret_name_v2(
+            self, "HFTokenSecret",
+            "HuggingFaceToken"  # The name of your pre-created secret
+        )
+
+        # Create IAM role for EC2 instances
+        role = iam.Role(
+            self, "VLLMInstanceRole",
+            assumed_by=iam.ServicePrincipal("ec2.amazonaws.com")
+        )
+
+        # Add managed policies
+        role.add_managed_policy(
+            iam.ManagedPolicy.from_aws_managed_policy_name("AmazonSSMManagedInstanceCore")
+        )
+        
+        # Add policy to read HF token
+        role.add_to_policy(iam.PolicyStatement(
+            actions=["secretsmanager:GetSecretValue"],
+            resources=[f"arn:aws:secretsmanager:{Stack.of(self).region}:{Stack.of(self).account}:secret:HuggingFaceToken*"]
+        ))
+
+        # Use a pre-baked AMI when one is configured, otherwise the stock
+        # Deep Learning AMI with GPU support
+        if prebaked_ami:
+            dl_ami = ec2.MachineImage.generic_linux(prebaked_ami)
+        else:
+            dl_ami = _get_dl_ami()
+
+        block_devices = [
+            ec2.BlockDevice(
+                device_name="/dev/sda1",  # Root volume (will appear as nvme0n1p1 inside the instance)
+                volume=ec2.BlockDeviceVolume.ebs(
+                    volume_size=70,  # 70 GB EBS volume
+                    volume_type=ec2.EbsDeviceVolumeType.GP3,  # GP3 for better performance
+                    delete_on_termination=True
+                )
+            )
+        ]
+
+        # Mount the pre-downloaded HuggingFace cache from a snapshot; bulk
+        # sequential reads from GP3 beat throttled HF CDN downloads
+        if weights_snapshot_id:
+            block_devices.append(
+                ec2.BlockDevice(
+                    device_name="/dev/sdb",  # Appears as nvme1n1 inside the instance
+                    volume=ec2.BlockDeviceVolume.ebs_from_snapshot(
+                        weights_snapshot_id,
+                        volume_type=ec2.EbsDeviceVolumeType.GP3,
+                        iops=16000,
+                        throughput=1000,
+                        delete_on_termination=True
+                    )
+                )
+            )
+
+        # Ship the bootstrap script as an S3 asset instead of interpolating
+        # it into UserData: the template carries a short fetch-and-run
+        # stanza rather than the whole multi-KB script, and the script
+        # itself stays plain shell (no f-string brace escaping)
+        bootstrap_asset = s3_assets.Asset(
+            self, "VLLMBootstrapScript",
+            path=os.path.join(os.path.dirname(__file__), "user_data", "vllm_bootstrap.sh")
+        )
+        bootstrap_asset.grant_read(role)
+
+        user_data = ec2.UserData.for_linux()
+        user_data.add_commands(
+            f"aws s3 cp {bootstrap_asset.s3_object_url} /tmp/vllm_bootstrap.sh",
+            f"MODEL_NAME='{model_name}'"
+            f" AWS_REGION={Stack.of(self).region}"
+            f" WEIGHTS_ATTACHED={'true' if weights_snapshot_id else 'false'}"
+            " bash /tmp/vllm_bootstrap.sh"
+        )
+
+        # Create launch template
+        launch_template = ec2.LaunchTemplate(
+            self, "VLLMLaunchTemplate",
+            instance_type=ec2.InstanceType("g5.xlarge"),  # GPU instance for vLLM
+            machine_image=dl_ami,
+            role=role,
+            block_devices=block_devices,
+            user_data=user_data,
+            security_group=network.vllm_sg
+        )
+
+        # Create Auto Scaling Group
+        self.vllm_asg = autoscaling.AutoScalingGroup(
+            self, "VLLMASG",
+            vpc=network.vpc,
+            vpc_subnets=ec2.SubnetSelection(
+                subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS
+            ),
+            launch_template=launch_template,
+            min_capacity=1,
+            max_capacity=2,
+            desired_capacity=1
+        )
+
+        # Attach ASG to target group
+        self.vllm_asg.attach_to_application_target_group(loadbalancer.vllm_target_group)
+
+        # Create ECS cluster for WebUI
+        self.cluster = ecs.Cluster(
+            self, "WebUICluster",
+            vpc=network.vpc,
+            container_insights=True
+        )
+
+        # Graviton capacity for the WebUI; a t4g.medium runs the mostly-idle
+        # container at a fraction of the equivalent Fargate vCPU price
+        webui_capacity_asg = autoscaling.AutoScalingGroup(
+            self, "WebUICapacityASG",
+            vpc=network.vpc,
+            vpc_subnets=ec2.SubnetSelection(
+                subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS
+            ),
+            instance_type=ec2.InstanceType("t4g.medium"),
+            machine_image=ecs.EcsOptimizedImage.amazon_linux2023(ecs.AmiHardwareType.ARM),
+            min_capacity=1,
+            max_capacity=1
+        )
+
+        webui_capacity_provider = ecs.AsgCapacityProvider(
+            self, "WebUICapacityProvider",
+            auto_scaling_group=webui_capacity_asg,
+            enable_managed_termination_protection=False  # Single-instance ASG; nothing to protect during scale-in
+        )
+        self.cluster.add_asg_capacity_provider(webui_capacity_provider)
+        
+        # Create S3 bucket holding the persisted OpenWebUI data between tasks
+        data_bucket = s3.Bucket(
+            self, "WebUIDataBucket",
+            block_public_access=s3.BlockPublicAccess.BLOCK_ALL,
+            removal_policy=RemovalPolicy.DESTROY  # For testing; change to RETAIN for production
+        )
+
+        # Create WebUI task on instance-local storage; SQLite page reads hit
+        # local disk instead of NFS round-trips. The ARM64 image from the
+        # README runs natively on the Graviton instances.
+        webui_task = ecs.Ec2TaskDefinition(
+            self, "WebUITask",
+            network_mode=ecs.NetworkMode.AWS_VPC  # Keep the task's own security group and IP target type
+        )
+
+        # Task-scoped volume on the ephemeral storage, shared with the restore container
+        webui_task.add_volume(
+            name="webui-data"
+        )
+
+        # Restore the persisted data from S3 before the WebUI starts. The
+        # bucket never holds the live database files, only the consistent
+        # database.backup.db snapshot, which is promoted to database.db here.
+        restore_container = webui_task.add_container(
+            "DataRestoreContainer",
+            image=ecs.ContainerImage.from_registry("public.ecr.aws/aws-cli/aws-cli:latest"),
+            essential=False,
+            memory_limit_mib=256,
+            entry_point=["/bin/sh", "-c"],
+            command=[
+                f"aws s3 sync s3://{data_bucket.bucket_name}/webui-data /app/backend/data && "
+                "if [ ! -f /app/backend/data/database.db ] && [ -f /app/backend/data/database.backup.db ]; then "
+                "cp /app/backend/data/database.backup.db /app/backend/data/database.db; fi"
+            ],
+            logging=ecs.LogDrivers.aws_logs(
+                stream_prefix="webui-restore"
+            )
+        )
+
+        restore_container.add_mount_points(
+            ecs.MountPoint(
+                container_path="/app/backend/data",
+                source_volume="webui-data",
+                read_only=False
+            )
+        )
+
+        webui_container = webui_task.add_container(
+            "WebUIContainer",
+            image=ecs.ContainerImage.from_registry("ghcr.io/open-webui/open-webui:main"),
+            memory_limit_mib=3072,  # Leaves headroom for the ECS agent on a 4 GiB t4g.medium
+            # Switch the database to WAL before the app starts: readers no
+            # longer block writers, which is safe now that the file lives on
+            # task-local storage instead of NFS. A background loop then takes
+            # a consistent database.backup.db snapshot through SQLite's
+            # online-backup API every five minutes — a raw copy of a WAL-mode
+            # database without its -wal file would be stale or corrupt — and
+            # the backup sidecar ships that snapshot to S3. The snapshot is
+            # written to a temp path and os.replace()d into place so the
+            # sidecar, which reads on its own timer, only ever sees a
+            # complete old or new file, never a half-written one. The
+            # image's default command is "bash start.sh", re-exec'd at
+            # the end.
+            command=[
+                "bash", "-c",
+                '''python -c "import sqlite3; \
+con = sqlite3.connect('/app/backend/data/database.db'); \
+con.execute('PRAGMA journal_mode=WAL'); \
+con.close()"
+(
+while true; do
+    sleep 300
+    python -c "import os, sqlite3; \
+src = sqlite3.connect('/app/backend/data/database.db'); \
+dst = sqlite3.connect('/app/backend/data/database.backup.db.tmp'); \
+src.backup(dst); \
+dst.close(); \
+src.close(); \
+os.replace('/app/backend/data/database.backup.db.tmp', '/app/backend/data/database.backup.db')"
+done
+) &
+exec bash start.sh'''
+            ],
+            environment={
+                "ENABLE_OLLAMA_API": "false",
+                "OPENAI_API_BASE_URL": f"http://{loadbalancer.vllm_alb.load_balancer_dns_name}/v1",
+                "DATA_DIR": "/app/backend/data",  # Explicitly set the data directory
+                "DATABASE_URL": "sqlite:////app/backend/data/database.db"  # Explicitly set the database path
+            },
+            logging=ecs.LogDrivers.aws_logs(
+                stream_prefix="webui"
+            )
+        )
+        
+        # Add mount point for the data volume
+        webui_container.add_mount_points(
+            ecs.MountPoint(
+                container_path="/app/backend/data",  # OpenWebUI data directory
+                source_volume="webui-data",
+                read_only=False
+            )
+        )
+
+        # Start the WebUI only after the restore finished
+        webui_container.add_container_dependencies(
+            ecs.ContainerDependency(
+                container=restore_container,
+                condition=ecs.ContainerDependencyCondition.SUCCESS
+            )
+        )
+
+        # Ship the data directory back to S3 every five minutes and once more
+        # on SIGTERM, so a task replacement loses at most one interval. The
+        # live database files are excluded; the WebUI container's snapshot
+        # loop provides the SQLite-safe copy.
+        backup_container = webui_task.add_container(
+            "DataBackupContainer",
+            image=ecs.ContainerImage.from_registry("public.ecr.aws/aws-cli/aws-cli:latest"),
+            essential=False,
+            memory_limit_mib=256,
+            entry_point=["/bin/sh", "-c"],
+            command=[
+                f'''_sync() {{
+    aws s3 sync /app/backend/data s3://{data_bucket.bucket_name}/webui-data \
+--exclude "database.db*" --exclude "database.backup.db.tmp*" --exclude "database.backup.db-journal"
+}}
+trap "_sync; exit 0" TERM
+while true; do
+    sleep 300 & wait $!
+    _sync
+done'''
+            ],
+            stop_timeout=Duration.seconds(120),  # Leave room for the final sync after SIGTERM
+            logging=ecs.LogDrivers.aws_logs(
+                stream_prefix="webui-backup"
+            )
+        )
+
+        backup_container.add_mount_points(
+            ecs.MountPoint(
+                container_path="/app/backend/data",
+                source_volume="webui-data",
+                read_only=True
+            )
+        )
+
+        # Never push a half-restored directory back to the bucket
+        backup_container.add_container_dependencies(
+            ecs.ContainerDependency(
+                container=restore_container,
+                condition=ecs.ContainerDependencyCondition.SUCCESS
+            )
+        )
+
+        # Restore on start and the backup loop both run under the task role
+        data_bucket.grant_read_write(webui_task.task_role)
+
+        webui_container.add_port_mappings(
+            ecs.PortMapping(container_port=8080)  # OpenWebUI uses port 8080 by default
+        )
+
+        self.webui_service = ecs.Ec2Service(
+            self, "WebUIService",
+            cluster=self.cluster,
+            task_definition=webui_task,
+            security_groups=[network.webui_sg],
+            vpc_subnets=ec2.SubnetSelection(
+                subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS
+            ),
+            capacity_provider_strategies=[
+                ecs.CapacityProviderStrategy(
+                    capacity_provider=webui_capacity_provider.capacity_provider_name,
+                    weight=1
+                )
+            ],
+            desired_count=1,
+            # A single t4g.medium cannot host old and new task side by side,
+            # so allow the old task to stop first during deployments
+            min_healthy_percent=0,
+            max_healthy_percent=100
+        )
+
+        # Attach WebUI service to ALB target group
+        self.webui_service.attach_to_application_target_group(loadbalancer.webui_target_group)
@@ -0,0 +1,88 @@
+#!/bin/bash
+# Bootstrap script for vLLM instances, shipped as an S3 asset and fetched
+# from UserData at boot. Parameters come in as environment variables:
+#   MODEL_NAME       - HuggingFace model to serve
+#   AWS_REGION       - region used for Secrets Manager lookups
+#   WEIGHTS_ATTACHED - "true" when an EBS volume with the HF cache is attached
+
+export PATH=/opt/conda/bin:$PATH
+
+# Install vLLM unless it is already baked into the AMI; the install pulls
+# several GB of wheels and dominates cold-start time on the stock DLAMI.
+# uv resolves vLLM's transitive tree far faster than pip and makes the
+# old per-boot "pip install --upgrade pip" unnecessary.
+if ! command -v vllm > /dev/null; then
+    curl -LsSf https://astral.sh/uv/install.sh | sh
+    "$HOME/.local/bin/uv" pip install --python "$(command -v python)" vllm
+fi
+
+# Get HuggingFace token from Secrets Manager
+HF_TOKEN=$(aws secretsmanager get-secret-value --secret-id HuggingFaceToken --query SecretString --output text --region "$AWS_REGION")
+
+# Login to HuggingFace
+huggingface-cli login --token $HF_TOKEN
+
+# Mount the model-weights volume and point the HuggingFace cache at it
+if [ "$WEIGHTS_ATTACHED" = "true" ]; then
+    WEIGHTS_DEV=/dev/sdb
+    [ -e "$WEIGHTS_DEV" ] || WEIGHTS_DEV=/dev/nvme1n1
+    mkdir -p /mnt/models
+    mount "$WEIGHTS_DEV" /mnt/models
+    rm -rf /home/ubuntu/.cache/huggingface
+    mkdir -p /home/ubuntu/.cache
+    ln -s /mnt/models /home/ubuntu/.cache/huggingface
+    chown -R ubuntu:ubuntu /mnt/models /home/ubuntu/.cache
+fi
+
+# Front vLLM with nginx so the many short-lived ALB connections collapse
+# onto a small keep-alive pool; vLLM itself only listens on loopback
+apt-get update -y
+apt-get install -y nginx
+cat << 'NGINXEOF' > /etc/nginx/conf.d/vllm.conf
+upstream vllm {
+    server 127.0.0.1:8001;
+    keepalive 32;
+}
+
+server {
+    listen 8000;
+
+    location / {
+        proxy_pass http://vllm;
+        proxy_http_version 1.1;
+        proxy_set_header Connection "";
+        proxy_buffering off;
+        proxy_read_timeout 300s;
+    }
+}
+NGINXEOF
+systemctl restart nginx
+
+# Create service file
+cat << EOF > /etc/systemd/system/vllm.service
+[Unit]
+Description=vLLM Service
+After=network.target
+
+[Service]
+Environment=HF_TOKEN=$HF_TOKEN
+ExecStart=vllm serve $MODEL_NAME  --port 8001  --host 127.0.0.1  --gpu-memory-utilization 0.9
+Restart=always
+User=ubuntu
+WorkingDirectory=/home/ubuntu
+
+[Install]
+WantedBy=multi-user.target
+EOF
+
+# Start vLLM service
+systemctl daemon-reload
+systemctl enable vllm
+systemctl start vllm
+
+# Wait for vLLM to be ready and kill health check
+(
+  while ! curl -s http://localhost:8000/v1/models > /dev/null; do
+    sleep 30
+  done
+) &
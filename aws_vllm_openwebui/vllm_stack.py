@@ -0,0 +1,65 @@
+from aws_cdk import (
+    Stack,
+)
+from constructs import Construct
+
+from .loadbalancer import LoadBalancerConstruct
+from .network import NetworkConstruct
+from .service import ServiceConstruct
+
+# Components a developer can ask for and what each one needs to exist first
+COMPONENT_DEPENDENCIES = {
+    "network": set(),
+    "loadbalancer": {"network"},
+    "service": {"network", "loadbalancer"},
+}
+
+
+class VLLMStack(Stack):
+    """Single stack hosting the network, load balancer and service layers.
+
+    Keeping everything in one stack lets the constructs pass references
+    to each other directly instead of going through CloudFormation
+    Exports/Imports, which keeps synth fast and deploys atomic. Logical
+    separation is preserved through the nested constructs.
+    """
+
+    def __init__(self, scope: Construct, construct_id: str, components=None, **kwargs) -> None:
+        super().__init__(scope, construct_id, **kwargs)
+
+        if components is None:
+            components = frozenset(COMPONENT_DEPENDENCIES)
+
+        self.network = NetworkConstruct(self, "Network")
+        self.loadbalancer = None
+        self.service = None
+        if "loadbalancer" in components:
+            self.loadbalancer = LoadBalancerConstruct(self, "LoadBalancer", self.network)
+        if "service" in components:
+            self.service = ServiceConstruct(self, "Service", self.network, self.loadbalancer)
+
+    @staticmethod
+    def resolve_components(spec):
+        """Expand a comma/space separated component list with its dependencies.
+
+        An empty or missing spec means the full stack. Skipping unneeded
+        components avoids their jsii construct-creation cost when iterating
+        on one layer (e.g. CDK_COMPONENTS=loadbalancer).
+
+        Filtering is for synth/diff inspection only: a filtered template
+        still describes the one real VLLMStack, so deploying it deletes
+        every resource of the layers that were skipped. app.py refuses to
+        deploy with a filter set.
+        """
+        if not spec or not spec.strip():
+            return frozenset(COMPONENT_DEPENDENCIES)
+        wanted = {name for name in spec.replace(",", " ").split()}
+        unknown = wanted - set(COMPONENT_DEPENDENCIES)
+        if unknown:
+            raise ValueError(
+                f"Unknown components {sorted(unknown)}; "
+                f"expected a subset of {sorted(COMPONENT_DEPENDENCIES)}"
+            )
+        for name in tuple(wanted):
+            wanted |= COMPONENT_DEPENDENCIES[name]
+        return frozenset(wanted)
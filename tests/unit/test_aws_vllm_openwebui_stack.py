@@ -1,15 +1,52 @@
 import aws_cdk as core
 import aws_cdk.assertions as assertions
 
-from aws_vllm_openwebui.aws_vllm_openwebui_stack import AwsVllmOpenwebuiStack
+from aws_vllm_openwebui.vllm_stack import VLLMStack
 
-# example tests. To run these tests, uncomment this file along with the example
-# resource in aws_vllm_openwebui/aws_vllm_openwebui_stack.py
-def test_sqs_queue_created():
-    app = core.App()
-    stack = AwsVllmOpenwebuiStack(app, "aws-vllm-openwebui")
+
+def _synth_template():
+    app = core.App(context={"vllm": {"model": "google/medgemma-4b-it"}})
+    stack = VLLMStack(
+        app, "VLLMStack",
+        env=core.Environment(account="123456789012", region="us-east-1")
+    )
+    return assertions.Template.from_stack(stack)
+
+
+def test_stack_contains_network_and_load_balancers():
+    template = _synth_template()
+
+    template.resource_count_is("AWS::EC2::VPC", 1)
+    template.resource_count_is("AWS::ElasticLoadBalancingV2::LoadBalancer", 2)
+    template.resource_count_is("AWS::CloudFront::Distribution", 1)
+
+
+def test_stack_contains_services():
+    template = _synth_template()
+
+    # One ASG for vLLM GPU instances, one for the WebUI Graviton capacity
+    template.resource_count_is("AWS::AutoScaling::AutoScalingGroup", 2)
+    template.resource_count_is("AWS::ECS::Service", 1)
+
+
+def test_component_filter_expands_dependencies_and_skips_the_rest():
+    assert VLLMStack.resolve_components("service") == {"network", "loadbalancer", "service"}
+    assert VLLMStack.resolve_components("loadbalancer") == {"network", "loadbalancer"}
+    assert VLLMStack.resolve_components(None) == {"network", "loadbalancer", "service"}
+
+    app = core.App(context={"vllm": {"model": "google/medgemma-4b-it"}})
+    stack = VLLMStack(
+        app, "VLLMStack",
+        components=frozenset({"network"}),
+        env=core.Environment(account="123456789012", region="us-east-1")
+    )
     template = assertions.Template.from_stack(stack)
+    template.resource_count_is("AWS::EC2::VPC", 1)
+    template.resource_count_is("AWS::ElasticLoadBalancingV2::LoadBalancer", 0)
+
+
+def test_no_cross_stack_exports():
+    template = _synth_template()
 
-#     template.has_resource_properties("AWS::SQS::Queue", {
-#         "VisibilityTimeout": 300
-#     })
+    # Everything lives in one stack, so no Fn::ImportValue should appear
+    assert "Fn::ImportValue" not in str(template.to_json())